@@ -8,67 +8,135 @@ Author: Mystify7777
 Version: 1.0.0
 """
 
-import json
+import functools
 import logging
+import mmap
 import os
 import random
 import secrets
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import orjson
 from flask import Flask, render_template, request, session, redirect, url_for, flash
+from flask.sessions import SecureCookieSessionInterface
 
 
 class Config:
     """Application configuration class."""
     
-    SECRET_KEY = os.environ.get("SECRET_KEY") or secrets.token_hex(32)
+    SECRET_KEY = os.environ.get("SECRET_KEY", "").encode() or secrets.token_bytes(32)
     DEBUG = os.environ.get("FLASK_DEBUG", "False").lower() == "true"
     QUESTIONS_FILE = "questions.json"
     MAX_QUESTIONS_PER_QUIZ = int(os.environ.get("MAX_QUESTIONS_PER_QUIZ", "10"))
 
 
+_UINT64_RANGE = 1 << 64
+_UINT64_MASK = _UINT64_RANGE - 1
+
+
+def _batched_shuffle(items: List) -> None:
+    """
+    Shuffle a list in place, drawing two swap indices per 64-bit random value.
+
+    This is a Fisher-Yates shuffle using Lemire's batched multiply-shift
+    ranged integers, with rejection sampling so the result stays unbiased.
+
+    Args:
+        items: List to shuffle in place
+    """
+    i = len(items) - 1
+    while i > 1:
+        bound = (i + 1) * i
+        if bound > _UINT64_RANGE:
+            # Product no longer fits in one draw; fall back to a classic step
+            j = random.randrange(i + 1)
+            items[i], items[j] = items[j], items[i]
+            i -= 1
+            continue
+
+        threshold = None
+        while True:
+            m = random.getrandbits(64) * (i + 1)
+            first = m >> 64
+            m = (m & _UINT64_MASK) * i
+            second = m >> 64
+            leftover = m & _UINT64_MASK
+            if leftover >= bound:
+                break
+            if threshold is None:
+                threshold = (_UINT64_RANGE - bound) % bound
+            if leftover >= threshold:
+                break
+
+        items[i], items[first] = items[first], items[i]
+        items[i - 1], items[second] = items[second], items[i - 1]
+        i -= 2
+
+    if i == 1:
+        j = random.getrandbits(1)
+        items[1], items[j] = items[j], items[1]
+
+
+# Performance (message, CSS class) indexed by percentage // 20
+_PERFORMANCE_LEVELS = (
+    ("Keep practicing! You'll improve!", "needs-improvement"),
+    ("Keep practicing! You'll improve!", "needs-improvement"),
+    ("Not bad! Room for improvement.", "average"),
+    ("Good job! Well done!", "good"),
+    ("Excellent! Outstanding performance!", "excellent"),
+    ("Excellent! Outstanding performance!", "excellent"),
+)
+
+
 class QuizService:
     """Service class to handle quiz-related business logic."""
     
     def __init__(self, questions_file: str):
         self.questions_file = Path(questions_file)
         self._questions_cache = None
+        self._question_ids = range(0)
         self.logger = logging.getLogger(__name__)
     
-    def load_questions(self) -> List[Dict]:
+    def load_questions(self) -> Tuple[Dict, ...]:
         """
         Load quiz questions from JSON file with error handling.
         
         Returns:
-            List of question dictionaries or empty list if file not found/invalid
+            Tuple of question dictionaries or empty tuple if file not found/invalid
         """
         if self._questions_cache is not None:
             return self._questions_cache
             
         try:
-            if self.questions_file.exists():
-                with open(self.questions_file, "r", encoding="utf-8") as file:
-                    questions = json.load(file)
-                    
-                # Validate question format
-                validated_questions = []
-                for i, question in enumerate(questions):
-                    if self._validate_question(question):
-                        validated_questions.append(question)
-                    else:
-                        self.logger.warning(f"Invalid question format at index {i}: {question}")
-                
-                self._questions_cache = validated_questions
-                self.logger.info(f"Loaded {len(validated_questions)} valid questions")
-                return validated_questions
-            else:
-                self.logger.warning(f"Questions file not found: {self.questions_file}")
-                return []
-                
-        except (json.JSONDecodeError, IOError) as e:
+            # Parse straight from a read-only mapping to avoid copying the file
+            with open(self.questions_file, "rb") as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view:
+                questions = orjson.loads(view)
+        except FileNotFoundError:
+            self.logger.warning(f"Questions file not found: {self.questions_file}")
+            return ()
+        except (ValueError, IOError) as e:  # ValueError covers orjson.JSONDecodeError and empty files
             self.logger.error(f"Error loading questions: {e}")
-            return []
+            return ()
+        
+        # Validate question format
+        validated_questions = []
+        for i, question in enumerate(questions):
+            if self._validate_question(question):
+                # Store the correct answer as an index into read-only options
+                options = tuple(question["options"])
+                question["options"] = options
+                question["correct_index"] = options.index(question.pop("correct_answer"))
+                validated_questions.append(question)
+            else:
+                self.logger.warning(f"Invalid question format at index {i}: {question}")
+        
+        self._questions_cache = tuple(validated_questions)
+        self._question_ids = range(len(self._questions_cache))
+        self.logger.info(f"Loaded {len(validated_questions)} valid questions")
+        return self._questions_cache
     
     def _validate_question(self, question: Dict) -> bool:
         """
@@ -80,43 +148,62 @@ class QuizService:
         Returns:
             True if valid, False otherwise
         """
-        required_keys = ["question", "options", "correct_answer"]
-        
         # Check required keys exist
-        if not all(key in question for key in required_keys):
-            return False
-            
-        # Check question is not empty
-        if not question["question"].strip():
-            return False
-            
-        # Check options is a list with at least 2 options
-        if not isinstance(question["options"], list) or len(question["options"]) < 2:
-            return False
-            
-        # Check correct answer is in options
-        if question["correct_answer"] not in question["options"]:
+        if not ("question" in question and "options" in question and "correct_answer" in question):
             return False
-            
-        return True
+
+        text = question["question"]
+        options = question["options"]
+
+        # Question must be non-empty text, options a list of at least 2,
+        # and the correct answer one of the options
+        return (
+            isinstance(text, str)
+            and bool(text)
+            and not text.isspace()
+            and isinstance(options, list)
+            and len(options) >= 2
+            and question["correct_answer"] in options
+        )
     
-    def get_shuffled_questions(self, max_questions: Optional[int] = None) -> List[Dict]:
+    def get_shuffled_question_ids(self, max_questions: Optional[int] = None) -> List[int]:
         """
-        Get shuffled questions for a new quiz session.
+        Get shuffled question IDs for a new quiz session.
+        
+        IDs are indices into the cached question tuple, so the session only
+        has to carry a few integers instead of the full question data.
         
         Args:
-            max_questions: Maximum number of questions to return
+            max_questions: Maximum number of question IDs to return
             
         Returns:
-            List of shuffled questions
+            List of shuffled question IDs
         """
-        questions = self.load_questions().copy()
-        random.shuffle(questions)
+        self.load_questions()
+        total = len(self._question_ids)
+        # Clamp so a negative limit yields an empty quiz instead of an error
+        count = max(0, min(max_questions or total, total))
+
+        if count == total:
+            # Full deck: shuffle every ID
+            question_ids = list(self._question_ids)
+            _batched_shuffle(question_ids)
+            return question_ids
+
+        # random.sample only draws `count` IDs
+        return random.sample(self._question_ids, count)
+    
+    def get_question(self, question_id: int) -> Dict:
+        """
+        Look up a cached question by ID.
         
-        if max_questions and len(questions) > max_questions:
-            questions = questions[:max_questions]
+        Args:
+            question_id: Index of the question in the cached question tuple
             
-        return questions
+        Returns:
+            Question dictionary
+        """
+        return self.load_questions()[question_id]
     
     def create_sample_questions(self) -> None:
         """Create sample questions file for development."""
@@ -164,17 +251,56 @@ class QuizService:
         ]
         
         try:
-            with open(self.questions_file, "w", encoding="utf-8") as file:
-                json.dump(sample_questions, file, indent=4)
+            self.questions_file.write_bytes(orjson.dumps(sample_questions, option=orjson.OPT_INDENT_2))
             self.logger.info(f"Created sample questions file: {self.questions_file}")
         except IOError as e:
             self.logger.error(f"Error creating sample questions: {e}")
 
 
+class OrjsonSessionSerializer:
+    """Session payload serializer backed by orjson."""
+    
+    def dumps(self, value: Dict) -> str:
+        """
+        Serialize session data for signing.
+        
+        Args:
+            value: Session dictionary to serialize
+            
+        Returns:
+            JSON text payload; Flask expects text from the signing serializer
+        """
+        return orjson.dumps(value).decode("utf-8")
+    
+    def loads(self, value: str) -> Dict:
+        """
+        Deserialize a verified session payload.
+        
+        Args:
+            value: JSON text payload
+            
+        Returns:
+            Session dictionary; tuples come back as lists, so answer records
+            must be unpacked rather than compared to tuples
+        """
+        return orjson.loads(value)
+
+
+class OrjsonSessionInterface(SecureCookieSessionInterface):
+    """
+    Signed cookie sessions serialized with orjson.
+    
+    Only plain JSON types are kept, so tuples come back as lists.
+    """
+    
+    serializer = OrjsonSessionSerializer()
+
+
 def create_app(config_class=Config) -> Flask:
     """Application factory function."""
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.session_interface = OrjsonSessionInterface()
     
     # Configure logging
     if not app.debug:
@@ -190,6 +316,9 @@ def create_app(config_class=Config) -> Flask:
     if app.debug and not Path(app.config['QUESTIONS_FILE']).exists():
         quiz_service.create_sample_questions()
     
+    # Load questions once at startup so requests never touch the file
+    quiz_service.load_questions()
+    
     return app, quiz_service
 
 
@@ -209,20 +338,24 @@ def index():
         # Clear any existing session data
         session.clear()
         
-        # Get fresh shuffled questions for this session
-        questions = quiz_service.get_shuffled_questions(app.config['MAX_QUESTIONS_PER_QUIZ'])
+        # Get fresh shuffled question IDs for this session
+        question_ids = quiz_service.get_shuffled_question_ids(app.config['MAX_QUESTIONS_PER_QUIZ'])
         
-        if not questions:
+        if not question_ids:
             flash("No questions available. Please contact the administrator.", "error")
             app.logger.warning("No questions available for quiz")
         
         # Initialize session data
-        session["quiz_questions"] = questions
+        session["total"] = len(question_ids)
         session["score"] = 0
         session["current_question_index"] = 0
         session["answers"] = []  # Track user answers for review
+        session["quiz_ids"] = question_ids  # Written last: marks the session valid
         
-        return render_template("index.html", total_questions=len(questions))
+        # Skip the render cache for flashed errors and when templates may reload
+        if not question_ids or app.jinja_env.auto_reload:
+            return render_template("index.html", total_questions=len(question_ids))
+        return _render_index(len(question_ids))
         
     except Exception as e:
         app.logger.error(f"Error in index route: {e}")
@@ -269,26 +402,26 @@ def results():
         return redirect(url_for("index"))
     
     try:
-        total_questions = len(session["quiz_questions"])
+        total_questions = session["total"]
         score = session["score"]
-        answers = session.get("answers", [])
+        
+        # Rebuild the answer review from the cached questions
+        answers = []
+        for question_id, chosen_index, is_correct in session.get("answers", []):
+            question = quiz_service.get_question(question_id)
+            answers.append({
+                "question": question["question"],
+                "user_answer": question["options"][chosen_index],
+                "correct_answer": question["options"][question["correct_index"]],
+                "is_correct": is_correct,
+                "options": question["options"]
+            })
         
         # Calculate percentage
         percentage = round((score / total_questions) * 100) if total_questions > 0 else 0
         
         # Determine performance message
-        if percentage >= 80:
-            performance_msg = "Excellent! Outstanding performance!"
-            performance_class = "excellent"
-        elif percentage >= 60:
-            performance_msg = "Good job! Well done!"
-            performance_class = "good"
-        elif percentage >= 40:
-            performance_msg = "Not bad! Room for improvement."
-            performance_class = "average"
-        else:
-            performance_msg = "Keep practicing! You'll improve!"
-            performance_class = "needs-improvement"
+        performance_msg, performance_class = _PERFORMANCE_LEVELS[min(percentage // 20, 5)]
         
         # Prepare results data
         results_data = {
@@ -312,6 +445,20 @@ def results():
 
 
 # Helper Functions
+@functools.lru_cache(maxsize=4)
+def _render_index(total_questions: int) -> str:
+    """
+    Render the welcome page once per quiz length and reuse the result.
+    
+    Args:
+        total_questions: Number of questions in the new quiz
+        
+    Returns:
+        Rendered index template
+    """
+    return render_template("index.html", total_questions=total_questions)
+
+
 def _is_valid_quiz_session() -> bool:
     """
     Check if the current session has valid quiz data.
@@ -319,8 +466,8 @@ def _is_valid_quiz_session() -> bool:
     Returns:
         True if session is valid, False otherwise
     """
-    required_keys = ["quiz_questions", "score", "current_question_index"]
-    return all(key in session for key in required_keys)
+    # index() writes "quiz_ids" after all other quiz keys
+    return "quiz_ids" in session
 
 
 def _handle_quiz_answer():
@@ -330,39 +477,37 @@ def _handle_quiz_answer():
     Returns:
         Redirect to next question or results page
     """
-    user_answer = request.form.get("answer")
+    idx = session["current_question_index"]
+    question_id = session["quiz_ids"][idx]
+    current_question = quiz_service.get_question(question_id)
+    
+    # The form posts the index of the chosen option
+    try:
+        chosen_index = int(request.form.get("answer", ""))
+    except ValueError:
+        chosen_index = -1
     
-    if not user_answer:
+    if not 0 <= chosen_index < len(current_question["options"]):
         flash("Please select an answer before proceeding.", "warning")
         return redirect(url_for("quiz"))
     
-    idx = session["current_question_index"]
-    current_question = session["quiz_questions"][idx]
-    correct_answer = current_question["correct_answer"]
-    
-    # Record the answer
-    is_correct = user_answer == correct_answer
-    answer_record = {
-        "question": current_question["question"],
-        "user_answer": user_answer,
-        "correct_answer": correct_answer,
-        "is_correct": is_correct,
-        "options": current_question["options"]
-    }
-    
-    if "answers" not in session:
-        session["answers"] = []
-    session["answers"].append(answer_record)
-    
-    # Update score if correct
-    if is_correct:
-        session["score"] += 1
-    
-    # Move to next question
-    session["current_question_index"] += 1
+    # Compare option text so repeated copies of the correct option all count
+    options = current_question["options"]
+    is_correct = options[chosen_index] == options[current_question["correct_index"]]
+    
+    # Record the answer as (question ID, chosen option index, is correct);
+    # question text is looked up again for results
+    answers = session.get("answers", [])
+    answers.append((question_id, chosen_index, is_correct))
+    
+    # Write back answers, score and position together; reassigning the
+    # list marks the session modified without relying on in-place mutation
+    session["answers"] = answers
+    session["score"] += is_correct
+    session["current_question_index"] = idx + 1
     
     # Check if quiz is finished
-    if session["current_question_index"] >= len(session["quiz_questions"]):
+    if idx + 1 >= session["total"]:
         return redirect(url_for("results"))
     
     return redirect(url_for("quiz"))
@@ -376,13 +521,13 @@ def _display_current_question():
         Rendered quiz template
     """
     idx = session["current_question_index"]
+    total_questions = session["total"]
     
     # Validate question index
-    if idx >= len(session["quiz_questions"]):
+    if idx >= total_questions:
         return redirect(url_for("results"))
     
-    current_question = session["quiz_questions"][idx]
-    total_questions = len(session["quiz_questions"])
+    current_question = quiz_service.get_question(session["quiz_ids"][idx])
     
     # Calculate progress percentage
     progress_percentage = round((idx / total_questions) * 100)
@@ -415,11 +560,6 @@ def internal_error(error):
 
 
 if __name__ == "__main__":
-    # Ensure we have a secret key in development
-    if not app.config['SECRET_KEY']:
-        app.logger.warning("No SECRET_KEY set. Using a temporary key for development.")
-        app.config['SECRET_KEY'] = secrets.token_hex(32)
-    
     # Run the application
     app.run(
         debug=app.config['DEBUG'],